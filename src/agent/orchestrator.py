@@ -2,6 +2,7 @@
 Main orchestrator for RAG-MCP Assistant
 Manages the decision flow between local RAG and web search
 """
+import time
 import logging
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
@@ -47,7 +48,9 @@ class RAGMCPOrchestrator:
                    query_text: str, 
                    force_web_search: bool = False,
                    include_sources: bool = True,
-                   max_results: int = 5) -> QueryResult:
+                   max_results: int = 5,
+                   collection: Optional[str] = None,
+                   filter: Optional[Dict[str, Any]] = None) -> QueryResult:
         """
         Process a query using RAG first, then MCP fallback if needed
         
@@ -56,17 +59,20 @@ class RAGMCPOrchestrator:
             force_web_search: Skip RAG and go directly to web search
             include_sources: Include source information in response
             max_results: Maximum number of results to return
+            collection: Document collection to search locally
+            filter: Metadata filter for the local search
             
         Returns:
             QueryResult with response, sources, and metadata
         """
-        import time
         start_time = time.time()
         
         try:
             # Try RAG first unless forced to use web search
             if not force_web_search:
-                rag_result = await self.rag_agent.search(query_text, max_results)
+                rag_result = await self.rag_agent.search(
+                    query_text, max_results, collection=collection, filter=filter
+                )
                 
                 if rag_result.confidence >= self.confidence_threshold:
                     logger.info(f"Query answered using RAG (confidence: {rag_result.confidence})")
@@ -145,9 +151,9 @@ Provide a well-structured response that addresses the query completely."""
         response = await self.llm.agenerate([messages])
         return response.generations[0][0].text.strip()
     
-    async def add_documents(self, documents: List[str]) -> None:
+    async def add_documents(self, documents: List[str], collection: Optional[str] = None) -> None:
         """Add new documents to the RAG system"""
-        await self.rag_agent.add_documents(documents)
+        await self.rag_agent.add_documents(documents, collection=collection)
         logger.info(f"Added {len(documents)} documents to RAG system")
     
     async def update_vector_store(self) -> None:
@@ -161,5 +167,14 @@ Provide a well-structured response that addresses the query completely."""
             "rag_agent": self.rag_agent.is_healthy(),
             "mcp_client": self.mcp_client.is_healthy(),
             "llm": True,  # Simple check - could be enhanced
+            "executors": self.rag_agent.get_executor_stats(),
             "timestamp": time.time()
-        }
\ No newline at end of file
+        }
+    
+    def get_executor_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get worker counts and queue depth of the RAG agent's executor pools"""
+        return self.rag_agent.get_executor_stats()
+    
+    def close(self) -> None:
+        """Shut down the RAG agent's executor pools"""
+        self.rag_agent.close()
\ No newline at end of file
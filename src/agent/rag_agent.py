@@ -3,7 +3,11 @@ RAG Agent implementation using LangChain and FAISS
 Handles local document retrieval and similarity search
 """
 import os
+import re
+import asyncio
 import logging
+import threading
+import weakref
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 
@@ -13,11 +17,15 @@ from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.document_loaders import TextLoader, PyPDFLoader
 from langchain.schema import Document
 
-from ..utils.vector_store import VectorStoreManager
+from ..utils.executors import ExecutorPool
+from ..utils.locks import ReadWriteLock
+from ..utils.vector_store import VectorStoreCache, similarity_search_with_filter
 from ..utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+COLLECTION_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_-]+$")
+
 @dataclass
 class RAGResult:
     response: str
@@ -25,6 +33,31 @@ class RAGResult:
     confidence: float
     retrieved_docs: List[Document]
 
+def _load_and_split(path: str, chunk_size: int, chunk_overlap: int) -> Optional[List[Document]]:
+    """Load and chunk a document; runs in a worker process"""
+    if path.endswith('.txt'):
+        loader = TextLoader(path)
+    elif path.endswith('.pdf'):
+        loader = PyPDFLoader(path)
+    else:
+        return None
+    
+    text_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        length_function=len,
+    )
+    return text_splitter.split_documents(loader.load())
+
+class _CollectionLock:
+    """Locks guarding one collection's index"""
+    
+    def __init__(self):
+        # Searches share the index; only in-memory adds are exclusive
+        self.rw = ReadWriteLock()
+        # Serializes loading and ingestion, including saves to disk
+        self.ingest = threading.RLock()
+
 class RAGAgent:
     """
     Retrieval-Augmented Generation agent using local vector database
@@ -35,6 +68,30 @@ class RAGAgent:
         self.vector_db_path = self.config.get("vector_db_path", "./data/vector_db")
         self.chunk_size = int(self.config.get("chunk_size", 1000))
         self.chunk_overlap = int(self.config.get("chunk_overlap", 200))
+        self.default_collection = self.config.get("default_collection", "default")
+        self.collections_path = self.config.get(
+            "collections_path",
+            os.path.join(os.path.dirname(os.path.normpath(self.vector_db_path)), "collections")
+        )
+        
+        # Loaded collections, evicted least recently used first
+        memory_budget_mb = float(self.config.get("collection_memory_budget_mb", 1024))
+        self._collections = VectorStoreCache(int(memory_budget_mb * 1024 * 1024))
+        # Weak so locks of unused or unknown collection names do not accumulate
+        self._collection_locks: "weakref.WeakValueDictionary[str, _CollectionLock]" = (
+            weakref.WeakValueDictionary()
+        )
+        self._collection_locks_guard = threading.Lock()
+        
+        # Blocking work runs off the event loop: FAISS and embedding calls
+        # release the GIL so threads suffice, document parsing does not
+        cpu_count = os.cpu_count() or 1
+        self._io_pool = ExecutorPool(
+            "rag-io", int(self.config.get("io_workers", min(32, cpu_count + 4)))
+        )
+        self._parse_pool = ExecutorPool(
+            "rag-parse", int(self.config.get("parse_workers", cpu_count)), use_processes=True
+        )
         
         # Initialize embeddings
         self.embeddings = OpenAIEmbeddings(
@@ -53,42 +110,145 @@ class RAGAgent:
         
         logger.info("RAG Agent initialized")
     
-    def _load_or_create_vector_store(self):
-        """Load existing vector store or create new one"""
-        try:
-            if os.path.exists(self.vector_db_path):
-                self.vector_store = FAISS.load_local(
-                    self.vector_db_path, 
-                    self.embeddings
-                )
-                logger.info(f"Loaded existing vector store from {self.vector_db_path}")
-            else:
+    def _collection_path(self, collection: str) -> str:
+        """Resolve the on-disk index path of a collection"""
+        if collection == self.default_collection:
+            return self.vector_db_path
+        if not COLLECTION_NAME_PATTERN.match(collection):
+            raise ValueError(f"Invalid collection name: {collection!r}")
+        return os.path.join(self.collections_path, collection)
+    
+    def _get_collection(self, collection: Optional[str], create: bool = False) -> Optional[FAISS]:
+        """
+        Return a collection's vector store, loading it from disk on first use
+        
+        Args:
+            collection: Collection name, defaults to the default collection
+            create: Create an empty index if the collection does not exist yet
+            
+        Returns:
+            FAISS vector store, or None if the collection does not exist
+        """
+        collection = collection or self.default_collection
+        vector_store = self._collections.get(collection)
+        if vector_store is not None:
+            return vector_store
+        
+        path = self._collection_path(collection)
+        lock = self._collection_lock(collection)
+        with lock.ingest:
+            # Another thread may have loaded it while we waited
+            vector_store = self._collections.get(collection)
+            if vector_store is not None:
+                return vector_store
+            
+            if os.path.exists(os.path.join(path, "index.faiss")):
+                vector_store = FAISS.load_local(path, self.embeddings)
+                logger.info(f"Loaded collection '{collection}' from {path}")
+            elif create:
                 # Create empty vector store
                 sample_doc = Document(page_content="Sample document", metadata={"source": "init"})
                 docs = self.text_splitter.split_documents([sample_doc])
-                self.vector_store = FAISS.from_documents(docs, self.embeddings)
-                self.vector_store.save_local(self.vector_db_path)
-                logger.info(f"Created new vector store at {self.vector_db_path}")
+                vector_store = FAISS.from_documents(docs, self.embeddings)
+                vector_store.save_local(path)
+                logger.info(f"Created collection '{collection}' at {path}")
+            else:
+                return None
+            
+            self._collections.put(collection, vector_store)
+        return vector_store
+    
+    def _collection_lock(self, collection: str) -> _CollectionLock:
+        """Locks of one collection; callers must keep a reference while using them"""
+        with self._collection_locks_guard:
+            lock = self._collection_locks.get(collection)
+            if lock is None:
+                lock = _CollectionLock()
+                self._collection_locks[collection] = lock
+            return lock
+    
+    def _search_collection(self, 
+                           collection: Optional[str], 
+                           embedding: List[float], 
+                           k: int,
+                           filter: Optional[Dict[str, Any]]) -> List:
+        """Blocking similarity search; runs on the I/O pool"""
+        collection = collection or self.default_collection
+        lock = self._collection_lock(collection)
+        vector_store = self._get_collection(collection)
+        if vector_store is None:
+            return []
+        
+        metadata_index = self._collections.get_metadata_index(collection)
+        
+        # FAISS indexes are not safe to search while another thread adds to them
+        with lock.rw.read():
+            return similarity_search_with_filter(
+                vector_store, embedding, k=k, filter=filter, metadata_index=metadata_index
+            )
+    
+    def _add_embeddings(self, 
+                        collection: str, 
+                        docs: List[Document], 
+                        embeddings: List[List[float]]) -> None:
+        """Blocking index update and save; runs on the I/O pool"""
+        path = self._collection_path(collection)
+        text_embeddings = list(zip([doc.page_content for doc in docs], embeddings))
+        metadatas = [doc.metadata for doc in docs]
+        
+        lock = self._collection_lock(collection)
+        with lock.ingest:
+            vector_store = self._get_collection(collection)
+            metadata_index = self._collections.get_metadata_index(collection)
+            if vector_store is None:
+                # Not visible to searches until it is cached below
+                vector_store = FAISS.from_embeddings(
+                    text_embeddings, self.embeddings, metadatas=metadatas
+                )
+                metadata_index = None
+            else:
+                # Add to existing vector store
+                with lock.rw.write():
+                    start = len(vector_store.index_to_docstore_id)
+                    vector_store.add_embeddings(text_embeddings, metadatas=metadatas)
+                    if metadata_index is not None:
+                        metadata_index.add(vector_store, start=start)
+            # Saving only reads the index, so searches continue meanwhile
+            vector_store.save_local(path)
+            # Re-insert so the memory estimate reflects the new chunks
+            self._collections.put(collection, vector_store, metadata_index)
+    
+    def _load_or_create_vector_store(self):
+        """Load existing vector store or create new one"""
+        try:
+            self._collections.remove(self.default_collection)
+            self._get_collection(self.default_collection, create=True)
         except Exception as e:
             logger.error(f"Error loading vector store: {e}")
             raise
     
-    async def search(self, query: str, max_results: int = 5) -> RAGResult:
+    async def search(self, 
+                    query: str, 
+                    max_results: int = 5,
+                    collection: Optional[str] = None,
+                    filter: Optional[Dict[str, Any]] = None) -> RAGResult:
         """
         Search the local vector database for relevant documents
         
         Args:
             query: Search query
             max_results: Maximum number of results to return
+            collection: Collection to search, defaults to the default collection
+            filter: Metadata filter applied before selecting the top results
             
         Returns:
             RAGResult with response and metadata
         """
         try:
             # Perform similarity search
-            docs = self.vector_store.similarity_search_with_score(
-                query, 
-                k=max_results
+            embedding = await self._io_pool.run(self.embeddings.embed_query, query)
+            docs = await self._io_pool.run(
+                self._search_collection, collection, embedding, max_results, filter
             )
             
             if not docs:
@@ -145,29 +305,32 @@ class RAGAgent:
         # For now, we'll return the most relevant chunk
         return f"Based on local documents: {docs[0].page_content[:500]}..."
     
-    async def add_documents(self, document_paths: List[str]) -> None:
-        """Add new documents to the vector store"""
+    async def add_documents(self, 
+                           document_paths: List[str], 
+                           collection: Optional[str] = None) -> None:
+        """Add new documents to the vector store of a collection"""
+        collection = collection or self.default_collection
         try:
+            # Validate before spending time on parsing and embedding
+            self._collection_path(collection)
             all_docs = []
             
-            for path in document_paths:
-                if path.endswith('.txt'):
-                    loader = TextLoader(path)
-                elif path.endswith('.pdf'):
-                    loader = PyPDFLoader(path)
-                else:
+            parsed = await asyncio.gather(*[
+                self._parse_pool.run(_load_and_split, path, self.chunk_size, self.chunk_overlap)
+                for path in document_paths
+            ])
+            for path, split_docs in zip(document_paths, parsed):
+                if split_docs is None:
                     logger.warning(f"Unsupported file type: {path}")
                     continue
-                
-                docs = loader.load()
-                split_docs = self.text_splitter.split_documents(docs)
                 all_docs.extend(split_docs)
             
             if all_docs:
-                # Add to existing vector store
-                self.vector_store.add_documents(all_docs)
-                self.vector_store.save_local(self.vector_db_path)
-                logger.info(f"Added {len(all_docs)} document chunks to vector store")
+                embeddings = await self._io_pool.run(
+                    self.embeddings.embed_documents, [doc.page_content for doc in all_docs]
+                )
+                await self._io_pool.run(self._add_embeddings, collection, all_docs, embeddings)
+                logger.info(f"Added {len(all_docs)} document chunks to collection '{collection}'")
             
         except Exception as e:
             logger.error(f"Error adding documents: {e}")
@@ -175,15 +338,27 @@ class RAGAgent:
     
     async def update_vector_store(self) -> None:
         """Refresh the vector store"""
-        # Reload the vector store
-        self._load_or_create_vector_store()
+        # Drop loaded collections so they are reloaded from disk on next use
+        self._collections.clear()
+        await self._io_pool.run(self._load_or_create_vector_store)
         logger.info("Vector store refreshed")
     
+    def get_executor_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get worker counts and queue depth of the executor pools"""
+        return {
+            "io": self._io_pool.stats(),
+            "parse": self._parse_pool.stats(),
+        }
+    
+    def close(self) -> None:
+        """Shut down the executor pools"""
+        self._io_pool.shutdown()
+        self._parse_pool.shutdown()
+    
     def is_healthy(self) -> bool:
         """Check if RAG agent is healthy"""
-        try:
-            # Simple health check - try to perform a search
-            test_docs = self.vector_store.similarity_search("test", k=1)
-            return True
-        except Exception:
-            return False
\ No newline at end of file
+        # No embedding calls or index loads: this runs on the event loop
+        return (
+            self.default_collection in self._collections
+            or os.path.exists(os.path.join(self.vector_db_path, "index.faiss"))
+        )
\ No newline at end of file
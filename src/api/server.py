@@ -2,24 +2,77 @@
 FastAPI server for the RAG-MCP Assistant.
 """
 
+import os
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional
+
 from fastapi import FastAPI
-from pydantic import BaseModel
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field
 
-app = FastAPI()
+from ..agent.orchestrator import RAGMCPOrchestrator
+from ..agent.rag_agent import COLLECTION_NAME_PATTERN
 
 class QueryRequest(BaseModel):
     query: str
     max_results: int = 5
+    collection: Optional[str] = Field(None, pattern=COLLECTION_NAME_PATTERN.pattern)
+    filter: Optional[Dict[str, Any]] = None
+
+def _orchestrator_config() -> Dict[str, Any]:
+    config = {
+        "vector_db_path": os.getenv("VECTOR_DB_PATH", "./data/vector_db"),
+        "embedding_model": os.getenv("EMBEDDING_MODEL", "text-embedding-ada-002"),
+        "chunk_size": os.getenv("CHUNK_SIZE", 1000),
+        "chunk_overlap": os.getenv("CHUNK_OVERLAP", 200),
+        "collection_memory_budget_mb": os.getenv("COLLECTION_MEMORY_BUDGET_MB", 1024),
+        "openai_model": os.getenv("OPENAI_MODEL", "gpt-4-turbo-preview"),
+        "temperature": os.getenv("TEMPERATURE", 0.7),
+        "confidence_threshold": os.getenv("CONFIDENCE_THRESHOLD", 0.7),
+    }
+    # Pool sizes default in RAGAgent, so only pass them when overridden
+    for key, env_var in (("io_workers", "IO_WORKERS"), ("parse_workers", "PARSE_WORKERS")):
+        if os.getenv(env_var):
+            config[key] = os.getenv(env_var)
+    return config
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Building the orchestrator loads or creates the default index, which blocks
+    app.state.orchestrator = await run_in_threadpool(RAGMCPOrchestrator, _orchestrator_config())
+    try:
+        yield
+    finally:
+        await run_in_threadpool(app.state.orchestrator.close)
+
+app = FastAPI(lifespan=lifespan)
+
+def get_orchestrator() -> RAGMCPOrchestrator:
+    return app.state.orchestrator
 
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
 
+@app.get("/metrics")
+def metrics():
+    return {"executors": get_orchestrator().get_executor_stats()}
+
 @app.post("/query")
 async def query(request: QueryRequest):
-    # Placeholder for query handling logic
+    result = await get_orchestrator().query(
+        request.query,
+        max_results=request.max_results,
+        collection=request.collection,
+        filter=request.filter
+    )
     return {
         "query": request.query,
         "max_results": request.max_results,
-        "response": "This is a placeholder response."
-    }
\ No newline at end of file
+        "collection": request.collection,
+        "filter": request.filter,
+        "response": result.response,
+        "sources": result.sources,
+        "confidence": result.confidence,
+        "search_method": result.search_method
+    }
@@ -0,0 +1,118 @@
+"""
+Executor pools for running blocking work off the asyncio event loop.
+"""
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import (
+    BrokenExecutor,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from typing import Any, Callable, Dict, Optional
+
+
+class ExecutorPool:
+    """
+    Wrapper around a concurrent.futures executor that tracks queue depth.
+
+    Tasks are counted from submission until the worker finishes them, so
+    the counters work the same for thread and process pools and stay
+    accurate when the awaiting coroutine is cancelled.
+    """
+
+    def __init__(self, name: str, max_workers: int, use_processes: bool = False):
+        self.name = name
+        self.max_workers = max_workers
+        self.use_processes = use_processes
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._succeeded = 0
+        self._failed = 0
+        self._cancelled = 0
+
+    def _get_executor(self) -> Executor:
+        # Created on first use so idle pools do not spawn workers
+        with self._lock:
+            if self._executor is None:
+                if self.use_processes:
+                    # The parent already runs worker threads, which fork does not survive
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn")
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix=self.name
+                    )
+            return self._executor
+
+    def _discard_executor(self, executor: Executor) -> None:
+        # A broken pool rejects all further work, so replace it on next use
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False)
+
+    def _on_done(self, future: Future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if future.cancelled():
+                self._cancelled += 1
+            elif future.exception() is not None:
+                self._failed += 1
+            else:
+                self._succeeded += 1
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Run a callable on the pool and await its result.
+
+        Args:
+            fn: Callable to run; must be picklable for process pools.
+            *args: Positional arguments for the callable.
+            **kwargs: Keyword arguments for the callable.
+
+        Returns:
+            The callable's return value.
+        """
+        executor = self._get_executor()
+        try:
+            future = executor.submit(fn, *args, **kwargs)
+        except BrokenExecutor:
+            self._discard_executor(executor)
+            with self._lock:
+                self._failed += 1
+            raise
+        with self._lock:
+            self._in_flight += 1
+        future.add_done_callback(self._on_done)
+
+        try:
+            return await asyncio.wrap_future(future)
+        except BrokenExecutor:
+            self._discard_executor(executor)
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        """Return worker count, in-flight tasks, queue depth and outcomes."""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "in_flight": self._in_flight,
+                "queue_depth": max(0, self._in_flight - self.max_workers),
+                "succeeded": self._succeeded,
+                "failed": self._failed,
+                "cancelled": self._cancelled,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the underlying executor; it is recreated on next use."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
@@ -1,10 +1,19 @@
 """
 Utility functions for managing vector stores.
 """
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
 
+import faiss
+import numpy as np
 from langchain.vectorstores import FAISS
 from langchain.schema import Document
 
+from .logger import setup_logger
+
+logger = setup_logger(__name__)
+
 def create_vector_store(docs: list, embeddings, path: str):
     """
     Create and save a vector store.
@@ -32,4 +41,223 @@ def load_vector_store(path: str, embeddings):
     Returns:
         FAISS vector store instance.
     """
-    return FAISS.load_local(path, embeddings)
\ No newline at end of file
+    return FAISS.load_local(path, embeddings)
+
+def _filter_values(value: Any) -> List[Any]:
+    return list(value) if isinstance(value, (list, tuple, set)) else [value]
+
+
+def _matches_filter(metadata: Dict[str, Any], filter: Dict[str, Any]) -> bool:
+    """Return True if metadata has every key of the filter with a matching value."""
+    for key, value in filter.items():
+        if key not in metadata or metadata[key] not in _filter_values(value):
+            return False
+    return True
+
+
+class MetadataIndex:
+    """
+    Inverted index from metadata key/value pairs to FAISS vector positions.
+
+    Lets metadata filters select candidate vectors without scanning the
+    docstore on every query. Keys with unhashable values are not indexed;
+    filters on them fall back to a scan.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[Any, Set[int]]] = {}
+        self._unindexed_keys: Set[str] = set()
+
+    @classmethod
+    def from_vector_store(cls, vector_store) -> "MetadataIndex":
+        metadata_index = cls()
+        metadata_index.add(vector_store)
+        return metadata_index
+
+    def add(self, vector_store, start: int = 0) -> None:
+        """Index the vectors of a store from position start onwards."""
+        for i in range(start, len(vector_store.index_to_docstore_id)):
+            doc = vector_store.docstore.search(vector_store.index_to_docstore_id[i])
+            if not isinstance(doc, Document):
+                continue
+            for key, value in doc.metadata.items():
+                try:
+                    self._postings.setdefault(key, {}).setdefault(value, set()).add(i)
+                except TypeError:
+                    self._unindexed_keys.add(key)
+
+    def ids_for(self, filter: Dict[str, Any]) -> Optional[Set[int]]:
+        """
+        Look up the vector positions matching a metadata filter.
+
+        Args:
+            filter: Metadata key/value pairs; list values match any element.
+
+        Returns:
+            Set of matching positions, or None if the filter cannot be
+            answered from the index.
+        """
+        result = None
+        for key, value in filter.items():
+            if key in self._unindexed_keys:
+                return None
+            postings = self._postings.get(key, {})
+            ids: Set[int] = set()
+            for v in _filter_values(value):
+                try:
+                    ids |= postings.get(v, set())
+                except TypeError:
+                    return None
+            result = ids if result is None else result & ids
+            if not result:
+                return set()
+        return result
+
+
+def _scan_ids(vector_store, filter: Dict[str, Any]) -> Set[int]:
+    """Find the vector positions matching a filter by scanning the docstore."""
+    ids = set()
+    for i, doc_id in vector_store.index_to_docstore_id.items():
+        doc = vector_store.docstore.search(doc_id)
+        if isinstance(doc, Document) and _matches_filter(doc.metadata, filter):
+            ids.add(i)
+    return ids
+
+
+def similarity_search_with_filter(vector_store, embedding: List[float], k: int,
+                                  filter: Optional[Dict[str, Any]] = None,
+                                  metadata_index: Optional[MetadataIndex] = None
+                                  ) -> List[Tuple[Document, float]]:
+    """
+    Run a similarity search restricted to documents matching a metadata filter.
+
+    The filter is turned into a FAISS ID selector so that only matching
+    vectors are scored, i.e. it is applied before top-k instead of after.
+
+    Args:
+        vector_store: FAISS vector store instance.
+        embedding: Query embedding.
+        k: Number of results to return.
+        filter: Metadata key/value pairs; list values match any element.
+        metadata_index: Index of the store's metadata; the docstore is
+            scanned when it is missing or cannot answer the filter.
+
+    Returns:
+        List of (document, distance) tuples, closest first.
+    """
+    if not filter:
+        return vector_store.similarity_search_with_score_by_vector(embedding, k=k)
+
+    allowed_ids = metadata_index.ids_for(filter) if metadata_index is not None else None
+    if allowed_ids is None:
+        allowed_ids = _scan_ids(vector_store, filter)
+    if not allowed_ids:
+        return []
+
+    selector = faiss.IDSelectorBatch(np.fromiter(allowed_ids, dtype=np.int64))
+    query = np.array([embedding], dtype=np.float32)
+    # Match the scoring of the unfiltered LangChain path
+    if getattr(vector_store, "_normalize_L2", False):
+        faiss.normalize_L2(query)
+    scores, indices = vector_store.index.search(
+        query,
+        min(k, len(allowed_ids)),
+        params=faiss.SearchParameters(sel=selector)
+    )
+
+    results = []
+    for score, i in zip(scores[0], indices[0]):
+        if i == -1:
+            continue
+        doc = vector_store.docstore.search(vector_store.index_to_docstore_id[i])
+        if isinstance(doc, Document):
+            results.append((doc, float(score)))
+    return results
+
+
+def estimate_vector_store_size(vector_store) -> int:
+    """
+    Estimate the in-memory size of a vector store in bytes.
+
+    Args:
+        vector_store: FAISS vector store instance.
+
+    Returns:
+        Approximate size of the float32 vectors plus document text.
+    """
+    index = vector_store.index
+    size = index.ntotal * index.d * 4
+    for doc_id in vector_store.index_to_docstore_id.values():
+        doc = vector_store.docstore.search(doc_id)
+        if isinstance(doc, Document):
+            size += len(doc.page_content)
+    return size
+
+
+class VectorStoreCache:
+    """
+    LRU cache of loaded vector stores bounded by an approximate memory budget.
+
+    Evicted stores are only dropped from memory; callers are expected to
+    have persisted them to disk already. Safe to use from worker threads.
+    """
+
+    def __init__(self, memory_budget_bytes: int):
+        self.memory_budget_bytes = memory_budget_bytes
+        self._stores: "OrderedDict[str, Tuple[Any, int, MetadataIndex]]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            return name in self._stores
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._stores)
+
+    @property
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum(size for _, size, _ in self._stores.values())
+
+    def get(self, name: str):
+        """Return a cached store and mark it most recently used, or None."""
+        with self._lock:
+            entry = self._stores.get(name)
+            if entry is None:
+                return None
+            self._stores.move_to_end(name)
+            return entry[0]
+
+    def get_metadata_index(self, name: str) -> Optional[MetadataIndex]:
+        """Return the metadata index of a cached store, or None."""
+        with self._lock:
+            entry = self._stores.get(name)
+            return entry[2] if entry is not None else None
+
+    def put(self, name: str, vector_store,
+            metadata_index: Optional[MetadataIndex] = None) -> None:
+        """Insert or refresh a store, evicting least recently used ones over budget."""
+        size = estimate_vector_store_size(vector_store)
+        if metadata_index is None:
+            metadata_index = MetadataIndex.from_vector_store(vector_store)
+        with self._lock:
+            self._stores[name] = (vector_store, size, metadata_index)
+            self._stores.move_to_end(name)
+            self._evict(keep=name)
+
+    def remove(self, name: str) -> None:
+        with self._lock:
+            self._stores.pop(name, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stores.clear()
+
+    def _evict(self, keep: str) -> None:
+        while self.total_bytes > self.memory_budget_bytes and len(self._stores) > 1:
+            name = next(iter(self._stores))
+            if name == keep:
+                break
+            self._stores.pop(name)
+            logger.info(f"Evicted collection '{name}' from memory")
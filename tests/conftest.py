@@ -0,0 +1,28 @@
+"""
+Shared fixtures for the test suite.
+"""
+
+import pytest
+from langchain.embeddings.base import Embeddings
+
+
+class FakeEmbeddings(Embeddings):
+    """Offline embeddings returning fixed vectors for known texts."""
+
+    def __init__(self, vectors=None, size=2):
+        self.vectors = vectors or {}
+        self.size = size
+
+    def _embed(self, text):
+        return list(self.vectors.get(text, [0.0] * self.size))
+
+    def embed_documents(self, texts):
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
+
+
+@pytest.fixture
+def fake_embeddings():
+    return FakeEmbeddings()
@@ -0,0 +1,79 @@
+"""
+Unit tests for the FastAPI server.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.agent.orchestrator import QueryResult
+from src.api import server
+
+class StubOrchestrator:
+    instances = []
+
+    def __init__(self, config):
+        self.config = config
+        self.queries = []
+        self.closed = False
+        StubOrchestrator.instances.append(self)
+
+    async def query(self, query_text, **kwargs):
+        self.queries.append((query_text, kwargs))
+        return QueryResult(
+            response="stub response",
+            sources=[],
+            confidence=0.8,
+            search_method="rag",
+            execution_time=0.0
+        )
+
+    def get_executor_stats(self):
+        return {"io": {"max_workers": 4, "queue_depth": 2}}
+
+    def close(self):
+        self.closed = True
+
+@pytest.fixture
+def client(monkeypatch):
+    StubOrchestrator.instances.clear()
+    monkeypatch.setattr(server, "RAGMCPOrchestrator", StubOrchestrator)
+    with TestClient(server.app) as client:
+        yield client
+
+def test_orchestrator_built_on_startup_and_closed_on_shutdown(monkeypatch):
+    StubOrchestrator.instances.clear()
+    monkeypatch.setattr(server, "RAGMCPOrchestrator", StubOrchestrator)
+    with TestClient(server.app):
+        assert len(StubOrchestrator.instances) == 1
+        assert not StubOrchestrator.instances[0].closed
+    assert StubOrchestrator.instances[0].closed
+
+def test_metrics_report_executor_stats(client):
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.json()["executors"]["io"]["queue_depth"] == 2
+
+def test_query_forwards_collection_and_filter(client):
+    response = client.post("/query", json={
+        "query": "refunds",
+        "collection": "acme",
+        "filter": {"source": "policies.pdf"},
+    })
+    assert response.status_code == 200
+    assert response.json()["response"] == "stub response"
+    assert response.json()["collection"] == "acme"
+    _, kwargs = StubOrchestrator.instances[0].queries[0]
+    assert kwargs["collection"] == "acme"
+    assert kwargs["filter"] == {"source": "policies.pdf"}
+
+def test_query_rejects_invalid_collection(client):
+    response = client.post("/query", json={"query": "refunds", "collection": "../other"})
+    assert response.status_code == 422
+    assert StubOrchestrator.instances[0].queries == []
+
+def test_pool_sizes_only_passed_when_set(monkeypatch):
+    monkeypatch.delenv("IO_WORKERS", raising=False)
+    monkeypatch.setenv("PARSE_WORKERS", "2")
+    config = server._orchestrator_config()
+    assert "io_workers" not in config
+    assert config["parse_workers"] == "2"
@@ -0,0 +1,77 @@
+"""
+Unit tests for the ExecutorPool class.
+"""
+
+import asyncio
+import threading
+
+import pytest
+from src.utils.executors import ExecutorPool
+
+@pytest.fixture
+def pool():
+    pool = ExecutorPool("test", max_workers=1)
+    yield pool
+    pool.shutdown()
+
+async def _wait_for(predicate):
+    while not predicate():
+        await asyncio.sleep(0.01)
+
+def _fail():
+    raise RuntimeError("boom")
+
+def test_runs_off_event_loop_thread(pool):
+    async def main():
+        return await pool.run(threading.get_ident)
+
+    assert asyncio.run(main()) != threading.get_ident()
+    assert pool.stats()["succeeded"] == 1
+
+def test_queue_depth_counts_waiting_tasks(pool):
+    release = threading.Event()
+
+    async def main():
+        tasks = [asyncio.ensure_future(pool.run(release.wait)) for _ in range(3)]
+        await _wait_for(lambda: pool.stats()["in_flight"] == 3)
+        stats = pool.stats()
+        release.set()
+        await asyncio.gather(*tasks)
+        return stats
+
+    stats = asyncio.run(main())
+    assert stats["queue_depth"] == 2
+    assert pool.stats()["in_flight"] == 0
+    assert pool.stats()["succeeded"] == 3
+
+def test_failure_counted(pool):
+    async def main():
+        with pytest.raises(RuntimeError):
+            await pool.run(_fail)
+
+    asyncio.run(main())
+    stats = pool.stats()
+    assert stats["failed"] == 1
+    assert stats["succeeded"] == 0
+    assert stats["in_flight"] == 0
+
+def test_cancellation_counted(pool):
+    release = threading.Event()
+
+    async def main():
+        running = asyncio.ensure_future(pool.run(release.wait))
+        queued = asyncio.ensure_future(pool.run(release.wait))
+        await _wait_for(lambda: pool.stats()["in_flight"] == 2)
+        running.cancel()
+        queued.cancel()
+        await asyncio.sleep(0.05)
+        # The running task cannot be interrupted and is still counted
+        stats = pool.stats()
+        release.set()
+        await _wait_for(lambda: pool.stats()["in_flight"] == 0)
+        return stats
+
+    stats = asyncio.run(main())
+    assert stats["in_flight"] == 1
+    assert stats["cancelled"] == 1
+    assert pool.stats()["succeeded"] == 1
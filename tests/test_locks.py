@@ -0,0 +1,37 @@
+"""
+Unit tests for the ReadWriteLock class.
+"""
+
+import threading
+
+from src.utils.locks import ReadWriteLock
+
+def test_readers_share_lock():
+    lock = ReadWriteLock()
+    both_inside = threading.Barrier(2, timeout=1)
+
+    def reader():
+        with lock.read():
+            both_inside.wait()
+
+    threads = [threading.Thread(target=reader) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not both_inside.broken
+
+def test_writer_excludes_readers():
+    lock = ReadWriteLock()
+    entered = threading.Event()
+
+    def reader():
+        with lock.read():
+            entered.set()
+
+    with lock.write():
+        thread = threading.Thread(target=reader)
+        thread.start()
+        assert not entered.wait(0.1)
+    thread.join(1)
+    assert entered.is_set()
@@ -11,4 +11,18 @@ def mock_config():
 
 def test_orchestrator_initialization(mock_config):
     orchestrator = RAGMCPOrchestrator(mock_config)
-    assert orchestrator.confidence_threshold == mock_config["confidence_threshold"]
\ No newline at end of file
+    assert orchestrator.confidence_threshold == mock_config["confidence_threshold"]
+class _StubComponent:
+    def is_healthy(self):
+        return True
+
+    def get_executor_stats(self):
+        return {"io": {"queue_depth": 0}}
+
+def test_health_status_includes_executor_stats():
+    orchestrator = RAGMCPOrchestrator.__new__(RAGMCPOrchestrator)
+    orchestrator.rag_agent = _StubComponent()
+    orchestrator.mcp_client = _StubComponent()
+    status = orchestrator.get_health_status()
+    assert status["executors"] == {"io": {"queue_depth": 0}}
+    assert status["timestamp"] > 0
@@ -2,13 +2,99 @@
 Unit tests for the RAGAgent class.
 """
 
+import asyncio
+import os
+
 import pytest
+from src.agent import rag_agent
 from src.agent.rag_agent import RAGAgent
 
+@pytest.fixture(autouse=True)
+def offline_embeddings(monkeypatch, fake_embeddings):
+    monkeypatch.setattr(rag_agent, "OpenAIEmbeddings", lambda model: fake_embeddings)
+
 @pytest.fixture
-def mock_config():
-    return {"vector_db_path": "./data/vector_db"}
+def mock_config(tmp_path):
+    return {"vector_db_path": str(tmp_path / "vector_db")}
 
 def test_rag_agent_initialization(mock_config):
     agent = RAGAgent(mock_config)
-    assert agent.vector_db_path == mock_config["vector_db_path"]
\ No newline at end of file
+    assert agent.vector_db_path == mock_config["vector_db_path"]
+
+def test_collections_stored_outside_default_index(mock_config, tmp_path):
+    agent = RAGAgent(mock_config)
+    assert agent._collection_path("tenant") == os.path.join(str(tmp_path), "collections", "tenant")
+
+def test_invalid_collection_name_rejected(mock_config):
+    agent = RAGAgent(mock_config)
+    with pytest.raises(ValueError):
+        agent._collection_path("../other")
+
+def test_unknown_collection_not_created(mock_config):
+    agent = RAGAgent(mock_config)
+    assert agent._get_collection("missing") is None
+    assert "missing" not in agent._collections
+    assert not os.path.exists(agent._collection_path("missing"))
+
+def test_collection_loaded_lazily(mock_config):
+    agent = RAGAgent(mock_config)
+    agent._get_collection("tenant", create=True)
+
+    agent = RAGAgent(mock_config)
+    assert "tenant" not in agent._collections
+    assert agent._get_collection("tenant") is not None
+    assert "tenant" in agent._collections
+
+def test_executor_stats_reported(mock_config):
+    agent = RAGAgent({**mock_config, "io_workers": 2, "parse_workers": 1})
+    stats = agent.get_executor_stats()
+    assert stats["io"]["max_workers"] == 2
+    assert stats["parse"]["max_workers"] == 1
+    agent.close()
+
+def test_is_healthy_without_search(mock_config, fake_embeddings, monkeypatch):
+    agent = RAGAgent(mock_config)
+    monkeypatch.setattr(fake_embeddings, "embed_query", lambda text: pytest.fail("embedded"))
+    assert agent.is_healthy()
+
+def test_collection_lock_kept_while_loading(mock_config, monkeypatch):
+    agent = RAGAgent(mock_config)
+    held = []
+
+    def load_local(path, embeddings):
+        held.append("tenant" in agent._collection_locks)
+        raise RuntimeError("stop")
+
+    path = agent._collection_path("tenant")
+    os.makedirs(path)
+    open(os.path.join(path, "index.faiss"), "w").close()
+    monkeypatch.setattr(rag_agent.FAISS, "load_local", load_local)
+    with pytest.raises(RuntimeError):
+        agent._get_collection("tenant")
+    assert held == [True]
+
+def test_collections_round_trip_isolated(mock_config, tmp_path):
+    paths = {}
+    for name, text in (("acme", "acme handbook"), ("globex_a", "globex memo"), ("globex_b", "globex report")):
+        paths[name] = tmp_path / f"{name}.txt"
+        paths[name].write_text(text)
+    agent = RAGAgent({**mock_config, "parse_workers": 1})
+
+    async def main():
+        await agent.add_documents([str(paths["acme"])], collection="acme")
+        await agent.add_documents([str(paths["globex_a"]), str(paths["globex_b"])], collection="globex")
+        return (
+            await agent.search("q", collection="acme"),
+            await agent.search("q", collection="globex", filter={"source": str(paths["globex_b"])}),
+            await agent.search("q"),
+            await agent.search("q", collection="missing"),
+        )
+
+    try:
+        acme, globex, default, missing = asyncio.run(main())
+    finally:
+        agent.close()
+    assert [doc.page_content for doc in acme.retrieved_docs] == ["acme handbook"]
+    assert [doc.page_content for doc in globex.retrieved_docs] == ["globex report"]
+    assert [doc.page_content for doc in default.retrieved_docs] == ["Sample document"]
+    assert missing.retrieved_docs == []
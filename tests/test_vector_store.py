@@ -0,0 +1,88 @@
+"""
+Unit tests for the vector store utilities.
+"""
+
+import pytest
+from langchain.vectorstores import FAISS
+
+from src.utils.vector_store import (
+    MetadataIndex,
+    VectorStoreCache,
+    _matches_filter,
+    estimate_vector_store_size,
+    similarity_search_with_filter,
+)
+
+@pytest.fixture
+def vector_store(fake_embeddings):
+    text_embeddings = [
+        ("near a", [0.0, 0.0]),
+        ("near b", [0.1, 0.0]),
+        ("far", [5.0, 5.0]),
+    ]
+    metadatas = [{"tenant": "a"}, {"tenant": "a"}, {"tenant": "b"}]
+    return FAISS.from_embeddings(text_embeddings, fake_embeddings, metadatas=metadatas)
+
+def _store(fake_embeddings, text):
+    return FAISS.from_embeddings([(text, [0.0, 0.0])], fake_embeddings)
+
+def test_matches_filter():
+    assert _matches_filter({"tenant": "a", "year": 2024}, {"tenant": "a"})
+    assert _matches_filter({"tenant": "a"}, {"tenant": ["a", "b"]})
+    assert not _matches_filter({"tenant": "a"}, {"tenant": "b"})
+    assert not _matches_filter({}, {"tenant": "a"})
+    assert not _matches_filter({}, {"tenant": None})
+
+def test_none_filter_matches_only_explicit_none(fake_embeddings):
+    store = FAISS.from_embeddings(
+        [("explicit", [0.0, 0.0]), ("missing", [0.1, 0.0])],
+        fake_embeddings,
+        metadatas=[{"tag": None}, {}]
+    )
+    metadata_index = MetadataIndex.from_vector_store(store)
+    scanned = similarity_search_with_filter(store, [0.0, 0.0], k=5, filter={"tag": None})
+    indexed = similarity_search_with_filter(
+        store, [0.0, 0.0], k=5, filter={"tag": None}, metadata_index=metadata_index
+    )
+    assert [doc.page_content for doc, _ in scanned] == ["explicit"]
+    assert [doc.page_content for doc, _ in indexed] == ["explicit"]
+
+def test_filter_applied_before_top_k(vector_store):
+    results = similarity_search_with_filter(vector_store, [0.0, 0.0], k=1, filter={"tenant": "b"})
+    assert [doc.page_content for doc, _ in results] == ["far"]
+
+def test_filter_with_metadata_index(vector_store):
+    metadata_index = MetadataIndex.from_vector_store(vector_store)
+    results = similarity_search_with_filter(
+        vector_store, [0.0, 0.0], k=5, filter={"tenant": "a"}, metadata_index=metadata_index
+    )
+    assert [doc.page_content for doc, _ in results] == ["near a", "near b"]
+
+def test_filter_without_matches(vector_store):
+    assert similarity_search_with_filter(vector_store, [0.0, 0.0], k=5, filter={"tenant": "c"}) == []
+
+def test_metadata_index_tracks_added_vectors(vector_store):
+    metadata_index = MetadataIndex.from_vector_store(vector_store)
+    start = len(vector_store.index_to_docstore_id)
+    vector_store.add_embeddings([("new", [1.0, 1.0])], metadatas=[{"tenant": "c"}])
+    metadata_index.add(vector_store, start=start)
+    assert metadata_index.ids_for({"tenant": "c"}) == {3}
+    assert metadata_index.ids_for({"tenant": ["a", "c"]}) == {0, 1, 3}
+
+def test_cache_evicts_least_recently_used(fake_embeddings):
+    stores = {name: _store(fake_embeddings, name) for name in ("a", "b", "c")}
+    size = estimate_vector_store_size(stores["a"])
+    cache = VectorStoreCache(memory_budget_bytes=size * 2)
+    cache.put("a", stores["a"])
+    cache.put("b", stores["b"])
+    assert cache.get("a") is stores["a"]
+    cache.put("c", stores["c"])
+    assert "b" not in cache
+    assert "a" in cache and "c" in cache
+    assert cache.total_bytes <= size * 2
+
+def test_cache_keeps_store_larger_than_budget(fake_embeddings):
+    cache = VectorStoreCache(memory_budget_bytes=1)
+    cache.put("one", _store(fake_embeddings, "one"))
+    assert "one" in cache
+    assert cache.get_metadata_index("one") is not None